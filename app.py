@@ -1,11 +1,18 @@
 # app.py
-from flask import Flask, render_template, request, redirect, url_for, flash, send_file
+from flask import Flask, render_template, request, redirect, url_for, flash, Response, stream_with_context
 import os
+import time
+import functools
+import asyncio
 import threading
+import unicodedata
+from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
 from main import GitHubRepoAnalyzer
 import uuid
 import logging
 from flask import jsonify
+from werkzeug.http import dump_options_header
 from datetime import datetime
 
 # Configure logging
@@ -19,43 +26,111 @@ app.secret_key = os.environ.get('SECRET_KEY', 'dev_key_for_flash_messages')
 REPORTS_DIR = os.path.join(os.getcwd(), 'reports')
 os.makedirs(REPORTS_DIR, exist_ok=True)
 
+# Read size used when streaming report downloads
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# How long finished jobs are kept before they are dropped from memory (seconds)
+JOB_TTL = 24 * 60 * 60
+
+class JobStore:
+    """
+    Thread-safe store for analysis jobs.
+    
+    Request handlers and analysis workers access jobs from different threads, so
+    every read and write goes through a lock. Reads return copies, and finished
+    jobs expire after `ttl` seconds so the store does not grow forever.
+    """
+
+    def __init__(self, ttl: int = JOB_TTL):
+        self._jobs = {}
+        self._expires_at = {}
+        self._ttl = ttl
+        self._lock = threading.RLock()
+
+    def create(self, job_id, job):
+        """Add a new job, dropping finished jobs that have expired."""
+        with self._lock:
+            now = time.monotonic()
+            for expired_id in [j for j, expires_at in self._expires_at.items() if expires_at <= now]:
+                del self._jobs[expired_id]
+                del self._expires_at[expired_id]
+            self._jobs[job_id] = dict(job)
+
+    def get(self, job_id):
+        """Return a copy of a job, or None if it does not exist."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def update(self, job_id, **fields):
+        """Update fields of a job and start its expiry clock once it has finished."""
+        with self._lock:
+            self._jobs[job_id].update(fields)
+            if fields.get('status') in ('completed', 'failed'):
+                self._expires_at[job_id] = time.monotonic() + self._ttl
+
+    def increment(self, job_id, field, limit):
+        """Increment a counter unless it has reached `limit`; return the new value or None."""
+        with self._lock:
+            job = self._jobs[job_id]
+            if job[field] >= limit:
+                return None
+            job[field] += 1
+            return job[field]
+
+    def snapshot(self):
+        """Return a copy of all jobs keyed by job ID."""
+        with self._lock:
+            return {job_id: dict(job) for job_id, job in self._jobs.items()}
+
 # Store analysis jobs
-analysis_jobs = {}
+analysis_jobs = JobStore()
+
+# Worker pool for background analyses, bounded so bursts of requests queue up
+# instead of each starting a new thread
+EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix='analysis')
+
+@functools.lru_cache(maxsize=16)
+def get_analyzer(api_key):
+    """Return the shared analyzer for an API key, creating it on first use."""
+    return GitHubRepoAnalyzer(api_key)
 
 def analyze_repo_async(job_id, repo_url, api_key, output_type, generate_pdf=False):
-    """Run the repository analysis in a separate thread."""
+    """Run the repository analysis on a worker pool thread."""
     try:
-        analyzer = GitHubRepoAnalyzer(api_key)
-        report_path, report_content = analyzer.analyze_repository(repo_url, output_type, REPORTS_DIR)
+        analyzer = get_analyzer(api_key)
+        report_path, report_content, analyses = asyncio.run(
+            analyzer.analyze_repository_async(repo_url, output_type, REPORTS_DIR)
+        )
         
-        analysis_jobs[job_id]['status'] = 'completed'
-        analysis_jobs[job_id]['report_path'] = report_path
-        
-        # Store the analyzer instance for chat functionality
-        analysis_jobs[job_id]['analyzer'] = analyzer
-        # Store the raw analyses for question answering
-        analysis_jobs[job_id]['analyses'] = analyzer._last_analyses if hasattr(analyzer, '_last_analyses') else []
-        # Initialize question counter
-        analysis_jobs[job_id]['question_count'] = 0
+        analysis_jobs.update(
+            job_id,
+            status='completed',
+            report_path=report_path,
+            # Store the analyzer instance for chat functionality
+            analyzer=analyzer,
+            # Store the raw analyses for question answering
+            analyses=analyses,
+            # Initialize question counter
+            question_count=0
+        )
         
         # Generate PDF if requested
         if generate_pdf and report_path:
-            pdf_path = analyzer.export_to_pdf(report_path)
-            analysis_jobs[job_id]['pdf_path'] = pdf_path
+            pdf_path = analyzer.export_to_pdf(report_path, report_content)
+            analysis_jobs.update(job_id, pdf_path=pdf_path)
             
     except Exception as e:
         logger.error(f"Analysis failed for job {job_id}: {e}")
-        analysis_jobs[job_id]['status'] = 'failed'
-        analysis_jobs[job_id]['error'] = str(e)
+        analysis_jobs.update(job_id, status='failed', error=str(e))
 
 # Add new routes for chat functionality
 @app.route('/chat/<job_id>', methods=['POST'])
 def chat(job_id):
-    if job_id not in analysis_jobs:
+    job = analysis_jobs.get(job_id)
+    if job is None:
         return jsonify({'error': 'Job not found'}), 404
     
-    job = analysis_jobs[job_id]
-    
     if job['status'] != 'completed':
         return jsonify({'error': 'Analysis not yet completed'}), 400
     
@@ -68,8 +143,10 @@ def chat(job_id):
     if not question:
         return jsonify({'error': 'No question provided'}), 400
     
-    # Increment question counter
-    job['question_count'] += 1
+    # Increment question counter (re-checked under the lock for concurrent requests)
+    question_count = analysis_jobs.increment(job_id, 'question_count', 10)
+    if question_count is None:
+        return jsonify({'error': 'Question limit reached (10 questions per repository)'}), 429
     
     try:
         # Get repository name
@@ -84,7 +161,7 @@ def chat(job_id):
         
         return jsonify({
             'answer': answer,
-            'remaining_questions': 10 - job['question_count']
+            'remaining_questions': 10 - question_count
         })
     except Exception as e:
         logger.error(f"Failed to answer question: {e}")
@@ -93,7 +170,7 @@ def chat(job_id):
 
 @app.route('/')
 def index():
-    return render_template('index.html', jobs=analysis_jobs)
+    return render_template('index.html', jobs=analysis_jobs.snapshot())
 
 @app.route('/analyze', methods=['POST'])
 def analyze():
@@ -123,7 +200,7 @@ def analyze():
     if repo_name.endswith('.git'):
         repo_name = repo_name[:-4]
         
-    analysis_jobs[job_id] = {
+    analysis_jobs.create(job_id, {
         'id': job_id,
         'repo_url': repo_url,
         'repo_name': repo_name,
@@ -133,15 +210,10 @@ def analyze():
         'pdf_path': None,
         'error': None,
         'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    }
+    })
     
-    # Start analysis in a separate thread
-    thread = threading.Thread(
-        target=analyze_repo_async,
-        args=(job_id, repo_url, api_key, output_type, generate_pdf)
-    )
-    thread.daemon = True
-    thread.start()
+    # Queue analysis on the worker pool
+    EXECUTOR.submit(analyze_repo_async, job_id, repo_url, api_key, output_type, generate_pdf)
     
     report_type_name = {
         "analysis": "Analysis report",
@@ -154,31 +226,65 @@ def analyze():
 
 @app.route('/status/<job_id>')
 def job_status(job_id):
-    if job_id not in analysis_jobs:
+    job = analysis_jobs.get(job_id)
+    if job is None:
         flash('Job not found', 'error')
         return redirect(url_for('index'))
     
-    return render_template('status.html', job=analysis_jobs[job_id])
+    return render_template('status.html', job=job)
+
+def attachment_header(filename):
+    """
+    Build a Content-Disposition attachment header, as send_file does.
+    
+    The name is quoted and escaped. Non-ASCII names get an ASCII fallback plus
+    an RFC 5987 filename* parameter.
+    """
+    try:
+        filename.encode('ascii')
+    except UnicodeEncodeError:
+        simple = unicodedata.normalize('NFKD', filename).encode('ascii', 'ignore').decode('ascii')
+        return dump_options_header('attachment', {
+            'filename': simple,
+            'filename*': "UTF-8''" + quote(filename, safe="!#$&+^`|~")
+        })
+    return dump_options_header('attachment', {'filename': filename})
+
+def stream_file(path, mimetype):
+    """Stream a file to the client as an attachment in fixed-size chunks."""
+    def generate():
+        with open(path, 'rb') as f:
+            while chunk := f.read(DOWNLOAD_CHUNK_SIZE):
+                yield chunk
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype=mimetype,
+        headers={
+            'Content-Disposition': attachment_header(os.path.basename(path)),
+            'Content-Length': str(os.path.getsize(path))
+        }
+    )
 
 @app.route('/download/<job_id>/<filetype>')
 def download_report(job_id, filetype):
-    if job_id not in analysis_jobs:
+    job = analysis_jobs.get(job_id)
+    if job is None:
         flash('Job not found', 'error')
         return redirect(url_for('index'))
     
-    job = analysis_jobs[job_id]
-    
     if job['status'] != 'completed':
         flash('Analysis not yet completed', 'error')
         return redirect(url_for('job_status', job_id=job_id))
     
     if filetype == 'md' and job['report_path']:
-        return send_file(job['report_path'], as_attachment=True)
+        return stream_file(job['report_path'], 'text/markdown')
     elif filetype == 'pdf' and job['pdf_path']:
-        return send_file(job['pdf_path'], as_attachment=True)
+        return stream_file(job['pdf_path'], 'application/pdf')
     else:
         flash(f'Requested file ({filetype}) not available', 'error')
         return redirect(url_for('job_status', job_id=job_id))
 
 if __name__ == '__main__':
+    # Development server only; for production, run under gunicorn (see README)
     app.run(debug=True)
\ No newline at end of file
@@ -1,14 +1,29 @@
 import os
 import sys
 import argparse
+import asyncio
+import json
+import re
+import time
+import hashlib
+import heapq
+import sqlite3
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import tempfile
+from string import Template
 import subprocess
+import shutil
 import glob
 import markdown
-import pdfkit
+import httpx
+import aiofiles
+from tenacity import (retry, retry_if_exception, stop_after_attempt, wait_random_exponential,
+                      before_sleep_log)
 from pathlib import Path
 import google.generativeai as genai
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Iterator, Optional
 import logging
 from dotenv import load_dotenv 
 from datetime import datetime
@@ -17,71 +32,689 @@ from datetime import datetime
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# REST endpoint used for concurrent chunk analysis (model name includes the "models/" prefix)
+GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1beta/{model}:generateContent"
+
+# Connection pool shared by the requests of one analysis; HTTP/2 multiplexes
+# concurrent requests over a few TLS connections
+HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+HTTP_TIMEOUT = 60.0
+
+# Throttling for concurrent Gemini requests; set GEMINI_RPM/GEMINI_TPM to your quota tier
+MAX_CONCURRENT = 8       # Requests in flight at once
+RPM = int(os.environ.get('GEMINI_RPM', 60))            # Requests per minute
+TPM = int(os.environ.get('GEMINI_TPM', 1_000_000))     # Prompt tokens per minute
+MAX_RETRIES = 5          # Retries on 429/5xx responses
+BACKOFF_BASE = 1.0       # Seconds, doubled on every retry
+BACKOFF_MAX = 30.0       # Upper bound for a single backoff sleep
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Where repositories are cloned; RAM-backed /dev/shm avoids disk I/O during clone and scan
+CLONE_TMPDIR = os.environ.get('REPO_TMPDIR', '/dev/shm' if os.path.isdir('/dev/shm') else None)
+
+# git errors meaning the server or local git cannot do a filtered, sparse clone;
+# any other clone failure (missing repo, auth, network) is not retried
+PARTIAL_CLONE_UNSUPPORTED = re.compile(
+    r"does not support filter|filtering not recognized|protocol\.version|unknown option|is not a git command",
+    re.IGNORECASE
+)
+
+# Persistent cache of Gemini responses; entries expire after CACHE_TTL seconds
+DEFAULT_CACHE_PATH = os.environ.get(
+    'REPO_ANALYSER_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'repo_analyser.sqlite')
+)
+CACHE_TTL = 7 * 24 * 60 * 60
+CACHE_PURGE_INTERVAL = 60 * 60   # How often a long-lived cache deletes expired entries (seconds)
+
+# Models tried in order; the one that worked last is remembered in MODEL_CACHE_PATH and tried first
+FALLBACK_MODELS = ('gemini-2.0-flash-lite', 'gemini-1.5-pro', 'gemini-pro')
+MODEL_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'repo_analyser_model')
+
+# Above this many analyses, the summary is built map-reduce style from
+# intermediate summaries of SUMMARY_GROUP_SIZE analyses each
+SUMMARY_REDUCE_THRESHOLD = 10
+SUMMARY_GROUP_SIZE = 8
+
+# Files larger than this are skipped (bytes)
+MAX_FILE_SIZE = 1024 * 1024
+
+# Leading bytes checked for NUL to detect binary files
+BINARY_SNIFF_SIZE = 8192
+
+# Threads used to list directories while walking a repository
+WALK_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Directories never descended into when collecting files
+SKIP_DIRS = frozenset({'.git', 'node_modules', '.venv', '__pycache__', 'dist', 'build'})
+
+# Total number of files analyzed per repository, picked by _score_file
+MAX_FILES_GLOBAL = 50
+
+# File names (without extension) that usually mark an entry point
+ENTRY_POINT_NAMES = frozenset({'main', '__init__', '__main__', 'index', 'app', 'server'})
+
+# Chunks are packed into shared prompts of up to this many (estimated) tokens of code,
+# and at most MAX_BATCH_CHUNKS chunks so the JSON answer fits in the response
+BATCH_TOKEN_LIMIT = 6000
+MAX_BATCH_CHUNKS = 8
+CHARS_PER_TOKEN = 4      # Rough estimate used to size chunks and batches
+
+# Files are split into chunks of up to this many (estimated) tokens, leaving
+# headroom in the request for the prompt and the response
+CHUNK_TOKEN_LIMIT = 6000
+
+class RateLimiter:
+    """
+    Sliding-window limiter for requests per minute and tokens per minute.
+    
+    Callers wait before sending whenever another request would exceed either
+    quota over the last 60 seconds, so requests are throttled up front instead
+    of being rejected with 429 and retried. One limiter is shared by everything
+    using an API key, across threads and event loops, so the window is guarded
+    by a thread lock and waiting happens outside it.
+    """
+
+    WINDOW = 60.0
+
+    def __init__(self, rpm: int = RPM, tpm: int = TPM):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._sent = deque()    # (monotonic time, estimated tokens) per request in the window
+        self._tokens = 0
+        self._lock = threading.Lock()
+
+    def _reserve(self, estimated_tokens: int) -> float:
+        """Record a request if it fits in both quotas; otherwise return how long to wait."""
+        # A single request larger than the whole TPM quota only has to wait for an empty window
+        estimated_tokens = min(estimated_tokens, self.tpm)
+        with self._lock:
+            now = time.monotonic()
+            while self._sent and self._sent[0][0] <= now - self.WINDOW:
+                self._tokens -= self._sent.popleft()[1]
+            if len(self._sent) < self.rpm and self._tokens + estimated_tokens <= self.tpm:
+                self._sent.append((now, estimated_tokens))
+                self._tokens += estimated_tokens
+                return 0.0
+            # Wait until the oldest request leaves the window
+            return self._sent[0][0] + self.WINDOW - now
+
+    async def acquire(self, estimated_tokens: int) -> None:
+        """Wait until a request of the given size fits in both quotas and record it."""
+        while (delay := self._reserve(estimated_tokens)) > 0:
+            await asyncio.sleep(delay)
+
+    def acquire_sync(self, estimated_tokens: int) -> None:
+        """Blocking version of acquire for requests sent outside an event loop."""
+        while (delay := self._reserve(estimated_tokens)) > 0:
+            time.sleep(delay)
+
+def _is_retryable_response(error: BaseException) -> bool:
+    """Return True for HTTP errors worth retrying (rate limits and server errors)."""
+    return isinstance(error, httpx.HTTPStatusError) and error.response.status_code in RETRY_STATUSES
+
+# Retry policy shared by the async and sync REST paths; full jitter keeps
+# concurrent retries from hitting the API in lockstep
+_retry_on_http_errors = retry(
+    retry=retry_if_exception(_is_retryable_response),
+    wait=wait_random_exponential(multiplier=BACKOFF_BASE, max=BACKOFF_MAX),
+    stop=stop_after_attempt(MAX_RETRIES + 1),
+    before_sleep=before_sleep_log(logger, logging.WARNING),
+    reraise=True
+)
+
+def _build_payload(prompt: str) -> Dict[str, Any]:
+    """Return the generateContent request body for a single-turn prompt."""
+    return {"contents": [{"parts": [{"text": prompt}]}]}
+
+def _response_text(response: httpx.Response) -> str:
+    """Raise on HTTP errors, otherwise return the text of the first candidate."""
+    response.raise_for_status()
+    return response.json()["candidates"][0]["content"]["parts"][0]["text"]
+
+class GeminiClient:
+    """
+    Bounded caller for the Gemini REST API, shared by all requests of one analysis.
+    
+    Requests go over a pooled HTTP/2 connection, are bounded by a semaphore, paced
+    by the RPM/TPM rate limiter and retried with exponential backoff and jitter on
+    rate-limit and server errors. Use as an async context manager.
+    """
+
+    def __init__(self, api_key: str, model_name: str, limiter: RateLimiter,
+                 max_concurrent: int = MAX_CONCURRENT):
+        self.api_key = api_key
+        self.url = GEMINI_API_URL.format(model=model_name)
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.limiter = limiter
+        self._client = httpx.AsyncClient(http2=True, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._client.aclose()
+
+    async def generate(self, prompt: str, description: str) -> str:
+        """
+        Send a prompt and return the response text.
+        
+        Args:
+            prompt: Prompt text
+            description: What the prompt is for, used in log messages
+            
+        Returns:
+            str: Response text
+        """
+        payload = _build_payload(prompt)
+        
+        async with self.semaphore:
+            logger.debug(f"Sending Gemini request for {description}")
+            return await self._post(payload, len(prompt) // CHARS_PER_TOKEN)
+
+    @_retry_on_http_errors
+    async def _post(self, payload: Dict[str, Any], estimated_tokens: int) -> str:
+        """Send one request once both rate limits allow it."""
+        await self.limiter.acquire(estimated_tokens)
+        response = await self._client.post(self.url, params={"key": self.api_key}, json=payload)
+        return _response_text(response)
+
+class LLMCache:
+    """
+    Persistent cache of Gemini responses keyed by a hash of the model and input.
+    
+    The analyzer sends single-turn prompts with default generation settings, so a
+    stored response is as good as a new one. Backed by SQLite so responses survive
+    restarts and are shared between jobs and processes; entries older than `ttl`
+    seconds are never returned and are purged on open and then every
+    CACHE_PURGE_INTERVAL seconds. Without a path, or if the file cannot be
+    opened, the cache lives in memory.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: float = CACHE_TTL):
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        try:
+            self._conn = self._connect(path)
+        except (OSError, sqlite3.Error) as e:
+            # The cache is only an optimization, so an unwritable location must not stop the analyzer
+            logger.warning(f"Failed to open response cache {path}, using an in-memory cache: {e}")
+            self._conn = self._connect(None)
+        self._last_purge = time.monotonic()
+
+    def _connect(self, path: Optional[str]) -> sqlite3.Connection:
+        """Open the database, create the table and purge expired entries."""
+        if path:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        conn = sqlite3.connect(path or ':memory:', check_same_thread=False)
+        try:
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS responses "
+                    "(key TEXT PRIMARY KEY, response TEXT NOT NULL, created_at REAL NOT NULL)"
+                )
+                conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self._ttl,))
+        except sqlite3.Error:
+            conn.close()
+            raise
+        return conn
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for a key, or None on a miss."""
+        try:
+            with self._lock:
+                # Long-lived caches outlive the purge on open, so check the age on every read
+                row = self._conn.execute(
+                    "SELECT response FROM responses WHERE key = ? AND created_at >= ?",
+                    (key, time.time() - self._ttl)
+                ).fetchone()
+            return row[0] if row else None
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to read response cache: {e}")
+            return None
+
+    def set(self, key: str, response: str) -> None:
+        """Store the response for a key, purging expired entries every CACHE_PURGE_INTERVAL seconds."""
+        try:
+            with self._lock, self._conn:
+                now = time.time()
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, response, created_at) VALUES (?, ?, ?)",
+                    (key, response, now)
+                )
+                # The web app keeps caches open for the life of the process, so purge periodically too
+                if time.monotonic() - self._last_purge >= CACHE_PURGE_INTERVAL:
+                    self._conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self._ttl,))
+                    self._last_purge = time.monotonic()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to write response cache: {e}")
+
+# Prompt templates, built once; only the $-placeholders change per call
+_CHUNK_TMPL = Template("""
+        You are a code analyst. Please analyze the following code from a GitHub repository. 
+        This is part of ${context}.
+        
+        CODE:
+        ```
+        ${code}
+        ```
+        
+        Analyze this code and extract insights that would help understand:
+        1. What functionality does this implement?
+        2. What patterns or architecture does it use?
+        3. What libraries/dependencies/frameworks does it utilize?
+        4. How does this fit into the overall project structure?
+        
+        Provide your analysis in a concise format focusing on the key insights.
+        """)
+
+_ANALYSIS_TMPL = Template("""
+        You are a technical documentation expert analyzing a full-stack application. Based on the following code analyses from the GitHub repository "${project_name}", 
+        generate a comprehensive markdown report with these sections:
+        
+        1. **Introduction** – What is the project about?
+        2. **Architecture Overview** - Identify the main components (frontend, backend, database) and how they connect
+        3. **Frontend Implementation** – Detail the UI components, state management, and user interactions
+        4. **Backend Implementation** – Detail the server-side code, API endpoints, and data processing
+        5. **Data Flow** – How data moves between frontend and backend
+        6. **Tech Stack Used** – Languages, frameworks, libraries used in both frontend and backend
+        7. **Conclusion** – Wrap-up summarizing the project's core functionality and value.
+        
+        CODE ANALYSES:
+        ${analyses}
+        
+        Make sure to analyze both frontend and backend components equally, even if one is more prominent in the code. If the repository appears to be a React Native application, ensure you identify and analyze any server-side code as well.
+        
+        Format your response as a valid Markdown document. Be specific and technical, focusing only on what can be determined from the code itself. Do not make assumptions beyond what's evident from the code. Use appropriate Markdown formatting including headers, code blocks, bullet points, etc.
+        """)
+
+_README_TMPL = Template("""
+        You are a README.md generator and a technical documentation expert. Based on the following code analysis from the GitHub repository "${project_name}", create a professional and informative README file in Markdown format. The README should include the following sections:
+
+        1. **# ${project_name}** – Use this as the title.
+        2. **## Introduction** – Briefly describe what the project is and its overall purpose.
+        3. **## Problem Statement / Idea** – Explain the problem it solves or the goal it aims to achieve.
+        4. **## Features** – List key features and functionalities implemented in the code.
+        5. **## How It Works (Implementation Overview)** – Describe the internal logic, core components, and workflow.
+        6. **## Tech Stack** – List programming languages, libraries, frameworks, and tools used.
+        7. **## Getting Started (optional)** – If setup steps are found in the code (like setup.py, package.json, or Dockerfile), summarize them here.
+        8. **## Conclusion** – Wrap up with a summary of the project's capabilities and use cases.
+
+        CODE ANALYSIS:
+        ${analyses}
+
+        Guidelines:
+        - Only include information that is evident from the code analysis. Do not speculate.
+        - Use proper Markdown formatting (headings, bullet points, code blocks, etc.).
+        - Maintain clarity, conciseness, and technical accuracy.
+        """)
+
+_GUIDANCE_TMPL = Template("""
+        You are a senior software engineer and technical project architect. Based on the following code analysis from the GitHub repository "${project_name}", generate a **precise and prioritized Markdown guide** that outlines **only what is missing, incomplete, flawed, or needs improvement** in the current project.
+
+        Your output should **strictly reflect the gaps and issues in the existing code** and serve as a clear technical to-do list to complete and enhance the project into a robust, full-stack application.
+
+        ### Your guide must:
+        1. Focus **only** on what is missing, partially implemented, buggy, or poorly structured — **do not add general guidance or best practices** unless the code clearly lacks it.
+        2. Include:
+        - Components or features that are not present but are implied to be needed
+        - Incomplete logic, commented-out or placeholder sections
+        - Bugs, unhandled cases, and performance concerns
+        - Code quality or structural issues that require refactoring
+        3. Highlight full-stack gaps:
+        - If the frontend is missing, clearly list what should be added based on backend endpoints or expected user interactions.
+        - If the backend is missing or incomplete, infer needed APIs or data handling from the frontend or related files.
+        - Point out if there’s no database model despite persistent data needs, no authentication for protected routes, or missing deployment configuration.
+        4. Group guide items under **technical categories** such as:
+        - `Frontend`
+        - `Backend`
+        - `API`
+        - `Database`
+        - `Authentication & Authorization`
+        - `Testing`
+        - `Deployment`
+        - `Code Quality & Refactoring`
+        5. Use Markdown guide under the header:
+
+        ## ✅ Next Steps to Complete and Improve the Project
+
+        CODE ANALYSIS:
+        ${analyses}
+
+        ### Output Instructions:
+        - Be brief but technically clear.
+        - Do **not** describe what is already complete unless it needs fixing or revision.
+        - Do **not** add assumptions not backed by the code.
+        - Prioritize core issues before enhancements.
+        """)
+
+# Prompt condensing a group of file analyses before the final summary
+_INTERMEDIATE_TMPL = Template("""
+        You are a code analyst. The following are analyses of some of the files in the GitHub repository "${project_name}".
+        
+        CODE ANALYSES:
+        ${analyses}
+        
+        Condense them into a single summary that keeps every concrete detail a project report would need: functionality, architecture and patterns, libraries and frameworks, API endpoints, data flow, and how these files relate to each other. Drop repetition and generic commentary.
+        """)
+
+# Page template for PDF export; only the $-placeholders change per call
+_PDF_TEMPLATE = Template("""
+    <!DOCTYPE html>
+        <html>
+        <head>
+            <meta charset="UTF-8">
+            <title>Repository Analysis</title>
+            <style>
+                /* Base styles */
+                body {
+                    font-family: 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, 'Open Sans', 'Helvetica Neue', sans-serif;
+                    line-height: 1.6;
+                    max-width: 900px;
+                    margin: 0 auto;
+                    padding: 30px;
+                    color: #333;
+                    background-color: #fff;
+                }
+
+                /* Headers */
+                h1 {
+                    font-size: 28px;
+                    color: #2c3e50;
+                    border-bottom: 2px solid #3498db;
+                    padding-bottom: 10px;
+                    margin-top: 20px;
+                    font-weight: 600;
+                }
+
+                h2 {
+                    font-size: 24px;
+                    color: #2980b9;
+                    margin-top: 24px;
+                    border-left: 4px solid #3498db;
+                    padding-left: 10px;
+                    font-weight: 500;
+                }
+
+                h3 {
+                    font-size: 20px;
+                    color: #16a085;
+                    margin-top: 20px;
+                    font-weight: 500;
+                }
+
+                /* Paragraphs and text */
+                p {
+                    margin-bottom: 16px;
+                    text-align: justify;
+                }
+
+                strong {
+                    color: #2c3e50;
+                    font-weight: 600;
+                }
+
+                em {
+                    color: #7f8c8d;
+                }
+
+                /* Code blocks */
+                code {
+                    font-family: 'Consolas', 'Monaco', 'Courier New', monospace;
+                    background-color: #f7f9fb;
+                    color: #e74c3c;
+                    padding: 2px 5px;
+                    border-radius: 3px;
+                    font-size: 90%;
+                    border: 1px solid #eaecef;
+                }
+
+                pre {
+                    background-color: #f8f8f8;
+                    padding: 15px;
+                    border-radius: 5px;
+                    overflow-x: auto;
+                    border: 1px solid #e1e4e8;
+                    margin: 16px 0;
+                }
+
+                pre code {
+                    background-color: transparent;
+                    padding: 0;
+                    border: none;
+                    color: #333;
+                    font-size: 14px;
+                    line-height: 1.5;
+                }
+
+                /* Lists */
+                ul, ol {
+                    padding-left: 20px;
+                    margin-bottom: 16px;
+                }
+
+                li {
+                    margin-bottom: 8px;
+                }
+
+                /* Tables */
+                table {
+                    border-collapse: collapse;
+                    width: 100%;
+                    margin: 20px 0;
+                    box-shadow: 0 1px 3px rgba(0,0,0,0.1);
+                }
+
+                th, td {
+                    text-align: left;
+                    padding: 12px;
+                    border: 1px solid #e1e4e8;
+                }
+
+                th {
+                    background-color: #f1f8ff;
+                    color: #0366d6;
+                    font-weight: 600;
+                }
+
+                tr:nth-child(even) {
+                    background-color: #f6f8fa;
+                }
+
+                tr:hover {
+                    background-color: #f0f4f8;
+                }
+
+                /* Blockquotes */
+                blockquote {
+                    border-left: 4px solid #3498db;
+                    padding: 10px 15px;
+                    margin: 16px 0;
+                    background-color: #f8f9fa;
+                    color: #4a5568;
+                    font-style: italic;
+                }
+
+                /* Links */
+                a {
+                    color: #3498db;
+                    text-decoration: none;
+                }
+
+                a:hover {
+                    text-decoration: underline;
+                    color: #2980b9;
+                }
+
+                /* Page header */
+                .repo-header {
+                    background-color: #f1f8ff;
+                    padding: 20px;
+                    margin-bottom: 30px;
+                    border-radius: 8px;
+                    border-left: 5px solid #0366d6;
+                }
+
+                .repo-header h1 {
+                    margin-top: 0;
+                    border-bottom: none;
+                }
+
+                /* Feature boxes */
+                .feature-section {
+                    margin: 25px 0;
+                    padding: 20px;
+                    background-color: #f8f9fa;
+                    border-radius: 8px;
+                    border: 1px solid #e1e4e8;
+                }
+
+                /* Footer */
+                .footer {
+                    margin-top: 40px;
+                    padding-top: 20px;
+                    border-top: 1px solid #eaecef;
+                    color: #6c757d;
+                    font-size: 14px;
+                    text-align: center;
+                }
+            </style>
+        </head>
+        <body>
+            <div class="repo-header">
+                <h1>Repository Analysis Report</h1>
+                <p>Comprehensive analysis powered by Google's Gemini AI</p>
+            </div>
+
+            ${html_content}
+
+            <div class="footer">
+                <p>Generated on ${timestamp} | GitHub Repository Analyzer</p>
+            </div>
+        </body>
+    </html>
+    """)
+
 class GitHubRepoAnalyzer:
-    def __init__(self, api_key: str):
+    # Common binary/non-text file extensions to ignore
+    IGNORED_EXTENSIONS = frozenset({
+        '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.svg', '.ico', '.tif', '.tiff',
+        '.pdf', '.doc', '.docx', '.ppt', '.pptx', '.xls', '.xlsx',
+        '.zip', '.tar', '.gz', '.rar', '.7z',
+        '.exe', '.dll', '.so', '.dylib', '.class', '.pyc',
+        '.mp3', '.mp4', '.avi', '.mov', '.wav', '.flac',
+        '.db', '.sqlite', '.sqlite3',
+        '.ttf', '.otf', '.woff', '.woff2',
+        '.bin', '.dat', '.pickle', '.pkl'
+    })
+    
+    # Extensions typically used for documentation
+    DOC_EXTENSIONS = frozenset({
+        '.md', '.rst', '.txt', '.pdf', '.doc', '.docx', '.html'
+    })
+    
+    # File names typically used for documentation
+    DOC_FILENAMES = frozenset({
+        'readme', 'license', 'contributing', 'changelog', 'documentation',
+        'docs', 'manual', 'guide', 'tutorial', 'faq', 'help'
+    })
+    
+    # Single pattern matching any documentation file name, searched once per file
+    _DOC_NAME_RE = re.compile('|'.join(map(re.escape, sorted(DOC_FILENAMES))))
+
+    def __init__(self, api_key: str, cache_path: Optional[str] = DEFAULT_CACHE_PATH):
         """
         Initialize the analyzer with a Google Gemini API key.
         
         Args:
             api_key: Google Gemini API key
+            cache_path: SQLite file for caching Gemini responses across runs (in-memory if None)
         """
         self.api_key = api_key
+        self.cache = LLMCache(cache_path)
+        
+        # RPM/TPM quotas belong to the API key, so every job using this analyzer shares one limiter
+        self.limiter = RateLimiter()
+        
+        # The SDK is only used to pick a model; prompts are sent over REST with this key
         genai.configure(api_key=api_key)
+        self.model = self._select_model()
+        
+        # Pooled client for synchronous requests such as chat; thread-safe, with the key sent per request
+        self._api_url = GEMINI_API_URL.format(model=self.model.model_name)
+        self._http = httpx.Client(http2=True, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+        
+        # Markdown converter for PDF export, built once since registering extensions is costly
+        self._md = markdown.Markdown(extensions=['extra', 'codehilite'])
+        self._md_lock = threading.Lock()
         
-        # Try using Gemini 2.0 Flash-Lite
+        # Summary prompt for each output type
+        self._prompts = {
+            "analysis": _ANALYSIS_TMPL,
+            "readme": _README_TMPL,
+            "guidance": _GUIDANCE_TMPL
+        }
+
+    def _select_model(self) -> genai.GenerativeModel:
+        """
+        Initialize the Gemini model, trying the last model that worked first.
+        
+        Returns:
+            genai.GenerativeModel: The first model that initializes successfully
+        """
+        cached_name = None
         try:
-            self.model = genai.GenerativeModel('gemini-2.0-flash-lite')
-            logger.info("Successfully initialized gemini-2.0-flash-lite model")
-        except Exception as e:
-            logger.warning(f"Failed to initialize gemini-2.0-flash-lite: {e}")
+            with open(MODEL_CACHE_PATH, 'r', encoding='utf-8') as f:
+                cached_name = f.read().strip() or None
+        except OSError:
+            pass
+        
+        candidates = [name for name in (cached_name, *FALLBACK_MODELS) if name]
+        for name in dict.fromkeys(candidates):
             try:
-                # Fall back to gemini-1.5-pro
-                self.model = genai.GenerativeModel('gemini-1.5-pro')
-                logger.info("Falling back to gemini-1.5-pro model")
-            except Exception as e2:
-                logger.warning(f"Failed to initialize gemini-1.5-pro: {e2}")
-                try:
-                    # Try another fallback
-                    self.model = genai.GenerativeModel('gemini-pro')
-                    logger.info("Falling back to gemini-pro model")
-                except Exception as e3:
-                    logger.warning(f"Failed to initialize gemini-pro: {e3}")
-                    # As last resort, list available models and use the first generative one
-                    models = genai.list_models()
-                    generative_models = [m for m in models if "generateContent" in m.supported_generation_methods]
-                    if generative_models:
-                        logger.info(f"Using available model: {generative_models[0].name}")
-                        self.model = genai.GenerativeModel(generative_models[0].name)
-                    else:
-                        raise ValueError("No suitable Gemini models found. Please check your API key and available models.")
-            
-        # Common binary/non-text file extensions to ignore
-        self.ignored_extensions = {
-            '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.svg', '.ico', '.tif', '.tiff',
-            '.pdf', '.doc', '.docx', '.ppt', '.pptx', '.xls', '.xlsx',
-            '.zip', '.tar', '.gz', '.rar', '.7z',
-            '.exe', '.dll', '.so', '.dylib', '.class', '.pyc',
-            '.mp3', '.mp4', '.avi', '.mov', '.wav', '.flac',
-            '.db', '.sqlite', '.sqlite3',
-            '.ttf', '.otf', '.woff', '.woff2',
-            '.bin', '.dat', '.pickle', '.pkl'
-        }
+                model = genai.GenerativeModel(name)
+            except Exception as e:
+                logger.warning(f"Failed to initialize {name}: {e}")
+                continue
+            logger.info(f"Successfully initialized {name} model")
+            self._remember_model(name, cached_name)
+            return model
         
-        # Extensions typically used for documentation
-        self.doc_extensions = {
-            '.md', '.rst', '.txt', '.pdf', '.doc', '.docx', '.html'
-        }
+        # As last resort, list available models and use the first generative one
+        models = genai.list_models()
+        generative_models = [m for m in models if "generateContent" in m.supported_generation_methods]
+        if not generative_models:
+            raise ValueError("No suitable Gemini models found. Please check your API key and available models.")
+        name = generative_models[0].name
+        logger.info(f"Using available model: {name}")
+        self._remember_model(name, cached_name)
+        return genai.GenerativeModel(name)
+
+    def _remember_model(self, name: str, cached_name: Optional[str]) -> None:
+        """
+        Save the selected model name so the next run tries it first.
         
-        # File names typically used for documentation
-        self.doc_filenames = {
-            'readme', 'license', 'contributing', 'changelog', 'documentation',
-            'docs', 'manual', 'guide', 'tutorial', 'faq', 'help'
-        }
+        Args:
+            name: Name of the model that was selected
+            cached_name: Name currently saved, if any
+        """
+        if name == cached_name:
+            return
+        try:
+            os.makedirs(os.path.dirname(MODEL_CACHE_PATH), exist_ok=True)
+            with open(MODEL_CACHE_PATH, 'w', encoding='utf-8') as f:
+                f.write(name)
+        except OSError as e:
+            logger.warning(f"Failed to save selected model: {e}")
 
     def clone_repository(self, repo_url: str, target_dir: str) -> bool:
         """
         Clone a GitHub repository to a target directory.
         
+        Uses a blobless partial clone with a sparse checkout so that files with
+        ignored extensions (images, archives, binaries, ...) are never downloaded.
+        Falls back to a plain shallow clone only if partial clone or sparse
+        checkout is unsupported by the server or the local git.
+        
         Args:
             repo_url: URL of the GitHub repository
             target_dir: Local directory to clone into
@@ -91,6 +724,34 @@ class GitHubRepoAnalyzer:
         """
         try:
             logger.info(f"Cloning repository: {repo_url}")
+            subprocess.run(
+                ["git", "clone", "--depth", "1", "--filter=blob:none", "--sparse", repo_url, target_dir],
+                check=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE
+            )
+            
+            # Check out everything except the extensions collect_code_files would skip anyway
+            patterns = ["/*"] + [f"!*{extension}" for extension in sorted(self.IGNORED_EXTENSIONS)]
+            subprocess.run(
+                ["git", "-C", target_dir, "sparse-checkout", "set", "--no-cone", *patterns],
+                check=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE
+            )
+            return True
+        except subprocess.CalledProcessError as e:
+            stderr = e.stderr.decode(errors='replace').strip() if e.stderr else ''
+            if not PARTIAL_CLONE_UNSUPPORTED.search(stderr):
+                logger.error(f"Failed to clone repository: {stderr or e}")
+                return False
+            # Servers without protocol v2 or partial clone support reject the filter
+            logger.warning(f"Partial clone unsupported, falling back to a shallow clone: {stderr}")
+        
+        try:
+            # Start again from an empty directory, since the failed clone may have left files behind
+            shutil.rmtree(target_dir, ignore_errors=True)
+            os.makedirs(target_dir, exist_ok=True)
             subprocess.run(
                 ["git", "clone", "--depth", "1", repo_url, target_dir],
                 check=True,
@@ -102,28 +763,87 @@ class GitHubRepoAnalyzer:
             logger.error(f"Failed to clone repository: {e}")
             return False
 
-    def is_documentation_file(self, filepath: str) -> bool:
+    def _split_extension(self, name: str) -> Tuple[str, int]:
         """
-        Check if a file is likely documentation.
+        Split the extension off a file name, treating leading dots as part of the stem.
         
         Args:
-            filepath: Path to the file
+            name: File name without directory
             
         Returns:
-            bool: True if the file appears to be documentation
+            Tuple[str, int]: (extension including the dot or '', index where the extension starts)
         """
-        filename = os.path.basename(filepath).lower()
-        extension = os.path.splitext(filename)[1].lower()
-        basename_without_ext = os.path.splitext(filename)[0].lower()
+        dot = name.rfind('.')
+        if dot <= 0 or name[:dot].strip('.') == '':
+            return '', len(name)
+        return name[dot:], dot
+
+    def _is_documentation_name(self, name: str) -> bool:
+        """
+        Check if a lowercased file name looks like documentation.
+        
+        Args:
+            name: Lowercased file name without directory
+            
+        Returns:
+            bool: True if the name appears to be documentation
+        """
+        extension, dot = self._split_extension(name)
         
         # Check if the file extension is typically used for documentation
-        if extension in self.doc_extensions:
-            # Check if the filename indicates it's documentation
-            for doc_name in self.doc_filenames:
-                if doc_name in basename_without_ext:
-                    return True
+        # and the filename indicates it's documentation
+        return extension in self.DOC_EXTENSIONS and self._DOC_NAME_RE.search(name, 0, dot) is not None
+
+    def _scan_directory(self, directory: str) -> Tuple[List[os.DirEntry], List[str]]:
+        """
+        List one directory, pruning SKIP_DIRS.
         
-        return False
+        Args:
+            directory: Directory to scan
+            
+        Returns:
+            Tuple[List[os.DirEntry], List[str]]: (file entries, subdirectory paths)
+        """
+        files = []
+        subdirs = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        # Prune VCS metadata, dependencies and build output before descending
+                        if entry.name not in SKIP_DIRS:
+                            subdirs.append(entry.path)
+                    elif entry.is_file():
+                        files.append(entry)
+        except OSError as e:
+            logger.warning(f"Failed to scan directory {directory}: {e}")
+        return files, subdirs
+
+    def _iter_files(self, directory: str) -> Iterator[Tuple[str, os.DirEntry]]:
+        """
+        Yield the files under a directory, scanning subdirectories in parallel.
+        
+        Directories are listed on a thread pool as soon as they are discovered,
+        so the walk is not serialized on directory read latency. Files are
+        yielded in completion order, not in tree order.
+        
+        Args:
+            directory: Directory to scan
+            
+        Yields:
+            Tuple[str, os.DirEntry]: (containing directory, file entry)
+        """
+        with ThreadPoolExecutor(max_workers=WALK_WORKERS, thread_name_prefix='walk') as pool:
+            pending = {pool.submit(self._scan_directory, directory): directory}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    current = pending.pop(future)
+                    files, subdirs = future.result()
+                    for subdir in subdirs:
+                        pending[pool.submit(self._scan_directory, subdir)] = subdir
+                    for entry in files:
+                        yield current, entry
 
     def collect_code_files(self, repo_dir: str) -> Dict[str, List[str]]:
         code_files = {}
@@ -134,133 +854,505 @@ class GitHubRepoAnalyzer:
         regular_files = []
         
         # Walk through the repository directory
-        for root, _, files in os.walk(repo_dir):
-            # Skip .git directory
-            if '.git' in root.split(os.path.sep):
+        for root, entry in self._iter_files(repo_dir):
+            is_priority = any(priority_dir in root.lower() for priority_dir in priority_dirs)
+            filepath = entry.path
+            
+            # Lowercase the name once; the extension and documentation checks both use it
+            name = entry.name.lower()
+            extension, _ = self._split_extension(name)
+            
+            # Skip binary and non-text files
+            if extension in self.IGNORED_EXTENSIONS:
                 continue
             
-            is_priority = any(priority_dir in root.lower() for priority_dir in priority_dirs)
+            # Skip documentation files
+            if self._is_documentation_name(name):
+                logger.info(f"Skipping documentation file: {filepath}")
+                continue
             
-            for file in files:
-                filepath = os.path.join(root, file)
-                
-                # Skip binary and non-text files
-                extension = os.path.splitext(file)[1].lower()
-                if extension in self.ignored_extensions:
-                    continue
-                
-                # Skip documentation files
-                if self.is_documentation_file(filepath):
-                    logger.info(f"Skipping documentation file: {filepath}")
-                    continue
-                
-                # Store filepath based on priority
-                if is_priority:
-                    important_files.append((extension, filepath))
-                else:
-                    regular_files.append((extension, filepath))
+            # Skip oversized files before they take a slot in the per-language selection
+            try:
+                file_size = entry.stat().st_size
+            except OSError as e:
+                logger.warning(f"Failed to stat file {filepath}: {e}")
+                continue
+            if file_size > MAX_FILE_SIZE:
+                logger.warning(f"File too large ({file_size/1024/1024:.2f} MB), skipping: {filepath}")
+                continue
+            
+            # Store filepath based on priority
+            if is_priority:
+                important_files.append((extension, filepath))
+            else:
+                regular_files.append((extension, filepath))
+        
+        # Process important files first, then regular files. The parallel walk
+        # yields in completion order, so sort shallow files first (as a top-down
+        # walk would) and by path within a depth to keep file selection stable.
+        def by_depth(entry: Tuple[str, str]) -> Tuple[int, str]:
+            return entry[1].count(os.sep), entry[1]
         
-        # Process important files first, then regular files
-        for extension, filepath in important_files + regular_files:
+        for extension, filepath in sorted(important_files, key=by_depth) + sorted(regular_files, key=by_depth):
             if extension not in code_files:
                 code_files[extension] = []
             code_files[extension].append(filepath)
         
         return code_files
 
-    def read_file_content(self, filepath: str, max_size: int = 1024 * 1024) -> str:
+    def _is_binary_file(self, filepath: str) -> bool:
         """
-        Read the content of a file safely, handling encoding issues.
+        Check the first BINARY_SNIFF_SIZE bytes of a file for a NUL byte.
         
         Args:
             filepath: Path to the file
-            max_size: Maximum file size to read (in bytes)
             
         Returns:
-            str: File content or empty string if there was an error
+            bool: True if the file looks binary or cannot be read
         """
         try:
-            # Check file size first
-            file_size = os.path.getsize(filepath)
-            if file_size > max_size:
-                logger.warning(f"File too large ({file_size/1024/1024:.2f} MB), skipping: {filepath}")
-                return f"[File too large: {filepath}]"
+            with open(filepath, 'rb') as f:
+                head = f.read(BINARY_SNIFF_SIZE)
+        except OSError as e:
+            logger.warning(f"Failed to read file {filepath}: {e}")
+            return True
+        
+        # A NUL byte near the start is a reliable sign of a binary file
+        if b'\x00' in head:
+            logger.info(f"Skipping binary file: {filepath}")
+            return True
+        return False
+
+    def _score_file(self, rel_path: str) -> int:
+        """
+        Score how representative a file is of the project, higher is better.
+        
+        Files near the repository root, entry points and server-side code score
+        higher; tests score lower.
+        
+        Args:
+            rel_path: Path of the file relative to the repository root
             
-            # Try to read with utf-8 encoding first
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return f.read()
-        except UnicodeDecodeError:
-            # If utf-8 fails, try with latin-1 encoding
-            try:
-                with open(filepath, 'r', encoding='latin-1') as f:
-                    return f.read()
-            except Exception as e:
-                logger.error(f"Failed to read file {filepath}: {e}")
-                return f"[Error reading file: {filepath}]"
+        Returns:
+            int: Priority score
+        """
+        parts = rel_path.lower().split(os.sep)
+        _, dot = self._split_extension(parts[-1])
+        stem = parts[-1][:dot]
+        score = -(len(parts) - 1)
+        if stem in ENTRY_POINT_NAMES:
+            score += 3
+        if any(part in ('server', 'backend', 'api') for part in parts[:-1]):
+            score += 2
+        if any(part in ('test', 'tests', '__tests__', 'spec') for part in parts[:-1]) or self._is_test_name(stem):
+            score -= 3
+        return score
+
+    def _is_test_name(self, stem: str) -> bool:
+        """
+        Check if a lowercased file name without extension names a test.
+        
+        Matches test_*, *_test, *.test and *.spec rather than any name containing
+        "test", so names such as latest.py are not demoted.
+        
+        Args:
+            stem: Lowercased file name without its extension
+            
+        Returns:
+            bool: True if the name follows a test naming convention
+        """
+        return (stem in ('test', 'tests') or stem.startswith('test_')
+                or stem.endswith(('_test', '.test', '.spec')))
+
+    async def read_file_content_async(self, filepath: str, max_size: int = MAX_FILE_SIZE) -> Optional[str]:
+        """
+        Read the content of a file without blocking the event loop.
+        
+        Args:
+            filepath: Path to the file
+            max_size: Maximum file size to read (in bytes)
+            
+        Returns:
+            Optional[str]: File content, an error marker if the file could not be read,
+            or None if it is binary or too large
+        """
+        try:
+            async with aiofiles.open(filepath, 'rb') as f:
+                raw = await f.read(max_size + 1)
         except Exception as e:
             logger.error(f"Failed to read file {filepath}: {e}")
             return f"[Error reading file: {filepath}]"
+        
+        return self._decode_content(raw, filepath, max_size)
+
+    def _decode_content(self, raw: bytes, filepath: str, max_size: int) -> Optional[str]:
+        """
+        Decode file bytes read with a one-byte over-read of `max_size`.
+        
+        Args:
+            raw: Bytes read from the file
+            filepath: Path to the file, for messages
+            max_size: Maximum file size (in bytes)
+            
+        Returns:
+            Optional[str]: Decoded content, or None if the file is too large or binary
+        """
+        if len(raw) > max_size:
+            logger.warning(f"File larger than {max_size/1024/1024:.2f} MB, skipping: {filepath}")
+            return None
+        
+        # File selection already skips binaries; this catches files read without it
+        if raw.find(b'\x00', 0, BINARY_SNIFF_SIZE) != -1:
+            logger.info(f"Skipping binary file: {filepath}")
+            return None
+        
+        # Decode once; undecodable bytes become U+FFFD instead of triggering a second pass
+        return raw.decode('utf-8', errors='replace')
 
-    def split_large_text(self, text: str, chunk_size: int = 10000) -> List[str]:
+    def split_large_text(self, text: str, max_tokens: int = CHUNK_TOKEN_LIMIT) -> Iterator[str]:
         """
-        Split text into smaller chunks to fit within API limits.
+        Split text into chunks of at most `max_tokens` estimated tokens.
+        
+        Chunks end at a blank line in the back half of the limit where possible,
+        then at the last line break, so paragraphs and lines are not cut in half.
+        A single line longer than the limit is cut at the character limit.
         
         Args:
             text: The text to split
-            chunk_size: Maximum character count per chunk
+            max_tokens: Maximum estimated token count per chunk
+            
+        Yields:
+            str: Text chunks, in order
+        """
+        chunk_size = max_tokens * CHARS_PER_TOKEN
+        start = 0
+        while start < len(text):
+            end = start + chunk_size
+            if end < len(text):
+                blank_line = text.rfind('\n\n', start + chunk_size // 2, end)
+                if blank_line != -1:
+                    end = blank_line + 2
+                else:
+                    newline = text.rfind('\n', start, end)
+                    if newline > start:
+                        end = newline + 1
+            yield text[start:end]
+            start = end
+
+    def _cache_key(self, text: str) -> str:
+        """
+        Compute the cache key for a model input.
+        
+        Chunk analyses are keyed by the code alone rather than the full prompt,
+        so identical files at different paths share one cached analysis.
+        Summaries are keyed by their full prompt.
+        
+        Args:
+            text: The code chunk or prompt sent to the model
             
         Returns:
-            List[str]: List of text chunks
+            str: Hex digest identifying the input for the current model
+        """
+        return hashlib.blake2b(f"{self.model.model_name}\0{text}".encode('utf-8'), digest_size=16).hexdigest()
+
+    @_retry_on_http_errors
+    def _generate_content(self, prompt: str) -> str:
         """
-        if len(text) <= chunk_size:
-            return [text]
+        Send a prompt through the Gemini REST API from a synchronous caller.
+        
+        The API key is passed with the request rather than through the SDK's
+        process-wide configuration, so analyzers for different keys can be used
+        from concurrent request threads.
         
-        chunks = []
-        for i in range(0, len(text), chunk_size):
-            chunks.append(text[i:i + chunk_size])
+        Args:
+            prompt: Prompt text
             
-        return chunks
+        Returns:
+            str: Response text
+        """
+        self.limiter.acquire_sync(len(prompt) // CHARS_PER_TOKEN)
+        response = self._http.post(self._api_url, params={"key": self.api_key}, json=_build_payload(prompt))
+        return _response_text(response)
 
-    def analyze_code_chunk(self, code_chunk: str, context: str) -> str:
+    def _build_chunk_prompt(self, code_chunk: str, context: str) -> str:
         """
-        Analyze a chunk of code using Gemini API.
+        Build the prompt used to analyze a single chunk of code.
         
         Args:
             code_chunk: The code to analyze
             context: Additional context to help with analysis
             
         Returns:
-            str: Analysis result
+            str: Prompt text
         """
-        prompt = f"""
-        You are a code analyst. Please analyze the following code from a GitHub repository. 
-        This is part of {context}.
+        return _CHUNK_TMPL.substitute(code=code_chunk, context=context)
+
+    def _build_batch_prompt(self, chunks: List[Tuple[str, str]]) -> str:
+        """
+        Build a prompt that asks for a separate analysis of several code chunks as JSON.
         
-        CODE:
-        ```
-        {code_chunk}
-        ```
+        Args:
+            chunks: List of (code chunk, context) pairs
+            
+        Returns:
+            str: Prompt text
+        """
+        sections = "\n\n".join(
+            f"--- CHUNK {i}: {context} ---\n```\n{code_chunk}\n```"
+            for i, (code_chunk, context) in enumerate(chunks)
+        )
         
-        Analyze this code and extract insights that would help understand:
+        return f"""
+        You are a code analyst. Please analyze each of the following {len(chunks)} code chunks from a GitHub repository.
+        
+        {sections}
+        
+        For each chunk, extract insights that would help understand:
         1. What functionality does this implement?
         2. What patterns or architecture does it use?
         3. What libraries/dependencies/frameworks does it utilize?
         4. How does this fit into the overall project structure?
         
-        Provide your analysis in a concise format focusing on the key insights.
+        Respond with only a JSON array containing one object per chunk, in order:
+        [{{"i": 0, "analysis": "..."}}, {{"i": 1, "analysis": "..."}}]
+        where "i" is the chunk number from its header and "analysis" is a concise Markdown
+        analysis of that chunk focusing on the key insights.
+        """
+
+    def _parse_batch_response(self, text: str, count: int) -> List[Optional[str]]:
+        """
+        Parse a batched JSON response back into one analysis per chunk.
+        
+        Args:
+            text: Model response containing a JSON array
+            count: Number of chunks in the batch
+            
+        Returns:
+            List[Optional[str]]: Analysis for each chunk in prompt order,
+            None where the response has no usable entry for the chunk
+        """
+        # Models often wrap JSON in a Markdown code fence
+        text = text.strip()
+        if text.startswith("```"):
+            text = text.split("\n", 1)[-1].rsplit("```", 1)[0]
+        
+        analyses = [None] * count
+        try:
+            for item in json.loads(text):
+                i = item["i"]
+                if 0 <= i < count and item["analysis"]:
+                    analyses[i] = str(item["analysis"])
+        except (ValueError, TypeError, KeyError) as e:
+            logger.warning(f"Could not parse batched analysis response: {e}")
+        
+        return analyses
+
+    async def _generate_cached(self, gemini: GeminiClient, cache_key: str, prompt: str, description: str) -> str:
+        """
+        Return the cached response for a key, or send the prompt and cache the response.
+        
+        Request errors are raised, so callers choose their own fallback.
+        
+        Args:
+            gemini: Bounded Gemini client shared by the analysis
+            cache_key: Key the response is cached under
+            prompt: Prompt text
+            description: What the prompt is for, used in log messages
+            
+        Returns:
+            str: Response text
+        """
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        response_text = await gemini.generate(prompt, description)
+        self.cache.set(cache_key, response_text)
+        return response_text
+
+    async def analyze_code_chunk_async(self, gemini: GeminiClient, code_chunk: str, context: str) -> str:
+        """
+        Analyze a chunk of code through the Gemini REST API without blocking the event loop.
+        
+        Args:
+            gemini: Bounded Gemini client shared by the analysis
+            code_chunk: The code to analyze
+            context: Additional context to help with analysis
+            
+        Returns:
+            str: Analysis result
         """
+        prompt = self._build_chunk_prompt(code_chunk, context)
         
         try:
-            response = self.model.generate_content(prompt)
-            return response.text
+            return await self._generate_cached(gemini, self._cache_key(code_chunk), prompt, context)
         except Exception as e:
             logger.error(f"Failed to analyze code chunk: {e}")
             return f"[Error analyzing code: {str(e)}]"
 
+    async def analyze_code_chunks_batched(self, gemini: GeminiClient, chunks: List[Tuple[str, str]]) -> List[str]:
+        """
+        Analyze several code chunks with a single Gemini request.
+        
+        Chunks missing from the model's response are analyzed again one by one.
+        
+        Args:
+            gemini: Bounded Gemini client shared by the analysis
+            chunks: List of (code chunk, context) pairs
+            
+        Returns:
+            List[str]: Analysis result for each chunk, in the order given
+        """
+        prompt = self._build_batch_prompt(chunks)
+        
+        try:
+            text = await gemini.generate(prompt, f"batch of {len(chunks)} chunks")
+            analyses = self._parse_batch_response(text, len(chunks))
+        except Exception as e:
+            logger.error(f"Failed to analyze batch of code chunks: {e}")
+            return [f"[Error analyzing code: {str(e)}]"] * len(chunks)
+        
+        for (code_chunk, _), analysis in zip(chunks, analyses):
+            if analysis is not None:
+                self.cache.set(self._cache_key(code_chunk), analysis)
+        
+        missing = [i for i, analysis in enumerate(analyses) if analysis is None]
+        if missing:
+            logger.warning(f"Batched response missed {len(missing)} of {len(chunks)} chunks, analyzing them separately")
+            retried = await asyncio.gather(*[self.analyze_code_chunk_async(gemini, *chunks[i]) for i in missing])
+            for i, analysis in zip(missing, retried):
+                analyses[i] = analysis
+        
+        return analyses
+
+    def _pack_chunks(self, chunks: List[Tuple[Tuple[int, int], str, str]]) -> List[List[Tuple[Tuple[int, int], str, str]]]:
+        """
+        Greedily pack chunks, in order, into batches that fit in one prompt.
+        
+        Batches are capped by estimated input tokens and by chunk count, since
+        every chunk adds an analysis to the response.
+        
+        Args:
+            chunks: List of ((file_idx, chunk_idx), code chunk, context) entries
+            
+        Returns:
+            List[List[Tuple[Tuple[int, int], str, str]]]: Batches of entries
+        """
+        batches = []
+        current, current_tokens = [], 0
+        
+        for entry in chunks:
+            tokens = (len(entry[1]) + len(entry[2])) // CHARS_PER_TOKEN
+            if current and (current_tokens + tokens > BATCH_TOKEN_LIMIT or len(current) >= MAX_BATCH_CHUNKS):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(entry)
+            current_tokens += tokens
+        if current:
+            batches.append(current)
+        
+        return batches
+
+    async def analyze_files_async(self, gemini: GeminiClient, files: List[Tuple[str, str]]) -> List[str]:
+        """
+        Analyze the chunks of several files concurrently.
+        
+        Files are split lazily, so only chunks missing from the cache are kept
+        in memory. Those are packed into batched prompts so that several chunks
+        share one request.
+        
+        Args:
+            gemini: Bounded Gemini client shared by the analysis
+            files: List of (relative path, content) pairs
+            
+        Returns:
+            List[str]: One combined analysis per file, in the order given
+        """
+        keyed = []
+        pending = []
+        for file_idx, (rel_path, content) in enumerate(files):
+            file_pending = []
+            n_chunks = 0
+            for chunk_idx, chunk in enumerate(self.split_large_text(content)):
+                n_chunks += 1
+                cached = self.cache.get(self._cache_key(chunk))
+                if cached is not None:
+                    keyed.append(((file_idx, chunk_idx), cached))
+                else:
+                    file_pending.append((chunk_idx, chunk))
+            
+            # Chunks end on line breaks, so the part count is only known once the file is split
+            for chunk_idx, chunk in file_pending:
+                context = f"file {rel_path} (part {chunk_idx+1}/{n_chunks})"
+                pending.append(((file_idx, chunk_idx), chunk, context))
+        logger.info(f"Reusing {len(keyed)} cached chunk analyses")
+        
+        batches = self._pack_chunks(pending)
+        tasks = []
+        for batch in batches:
+            if len(batch) == 1:
+                # A batch of one gains nothing, so use the single-chunk prompt
+                _, chunk, context = batch[0]
+                tasks.append(self.analyze_code_chunk_async(gemini, chunk, context))
+            else:
+                tasks.append(self.analyze_code_chunks_batched(gemini, [(chunk, context) for _, chunk, context in batch]))
+        
+        logger.info(f"Dispatching {len(pending)} chunk analyses in {len(tasks)} requests concurrently")
+        results = await asyncio.gather(*tasks)
+        
+        # Flatten single and batched results back to one analysis per (file_idx, chunk_idx)
+        for batch, result in zip(batches, results):
+            batch_results = [result] if isinstance(result, str) else result
+            keyed.extend((key, analysis) for (key, _, _), analysis in zip(batch, batch_results))
+        
+        # Reassemble chunk analyses per file
+        file_analyses = [[] for _ in files]
+        for (file_idx, chunk_idx), analysis in sorted(keyed):
+            file_analyses[file_idx].append(analysis)
+        
+        return [
+            f"## Analysis of {rel_path}\n\n" + "\n\n".join(file_analysis)
+            for (rel_path, _), file_analysis in zip(files, file_analyses)
+        ]
+
+    def _build_summary_prompt(self, analyses: List[str], project_name: str, output_type: str) -> str:
+        """
+        Build the prompt for the project summary of the given output type.
+        
+        Args:
+            analyses: List of code analyses
+            project_name: Name of the GitHub repository
+            output_type: Normalized output type (analysis, readme, guidance)
+            
+        Returns:
+            str: Prompt text
+        """
+        combined_analyses = "\n\n".join(analyses)
+        template = self._prompts[output_type]
+        return template.substitute(project_name=project_name, analyses=combined_analyses)
+
+    def _normalize_output_type(self, output_type: str) -> str:
+        """
+        Map an unknown output type to 'analysis'.
+        
+        Args:
+            output_type: Requested output type
+            
+        Returns:
+            str: A key of the summary prompt table
+        """
+        if output_type in self._prompts:
+            return output_type
+        logger.warning(f"Unknown output type '{output_type}', defaulting to 'analysis'")
+        return "analysis"
+
     def generate_project_summary(self, analyses: List[str], project_name: str, output_type: str = "analysis") -> str:
         """
         Generate a project summary based on code analyses with different output formats.
         
+        Runs generate_project_summary_async on a new event loop, so the summary is
+        built the same way as during a full analysis.
+        
         Args:
             analyses: List of code analyses
             project_name: Name of the GitHub repository
@@ -269,101 +1361,86 @@ class GitHubRepoAnalyzer:
         Returns:
             str: Markdown report
         """
-        combined_analyses = "\n\n".join(analyses)
+        async def summarize() -> str:
+            async with GeminiClient(self.api_key, self.model.model_name, self.limiter) as gemini:
+                return await self.generate_project_summary_async(gemini, analyses, project_name, output_type)
         
-        if output_type == "analysis":
-            prompt = f"""
-            You are a technical documentation expert analyzing a full-stack application. Based on the following code analyses from the GitHub repository "{project_name}", 
-            generate a comprehensive markdown report with these sections:
-            
-            1. **Introduction** – What is the project about?
-            2. **Architecture Overview** - Identify the main components (frontend, backend, database) and how they connect
-            3. **Frontend Implementation** – Detail the UI components, state management, and user interactions
-            4. **Backend Implementation** – Detail the server-side code, API endpoints, and data processing
-            5. **Data Flow** – How data moves between frontend and backend
-            6. **Tech Stack Used** – Languages, frameworks, libraries used in both frontend and backend
-            7. **Conclusion** – Wrap-up summarizing the project's core functionality and value.
-            
-            CODE ANALYSES:
-            {combined_analyses}
-            
-            Make sure to analyze both frontend and backend components equally, even if one is more prominent in the code. If the repository appears to be a React Native application, ensure you identify and analyze any server-side code as well.
-            
-            Format your response as a valid Markdown document. Be specific and technical, focusing only on what can be determined from the code itself. Do not make assumptions beyond what's evident from the code. Use appropriate Markdown formatting including headers, code blocks, bullet points, etc.
-            """
-        elif output_type == "readme":
-            prompt = f"""
-            You are a README.md generator and a technical documentation expert. Based on the following code analysis from the GitHub repository "{project_name}", create a professional and informative README file in Markdown format. The README should include the following sections:
-
-            1. **# {project_name}** – Use this as the title.
-            2. **## Introduction** – Briefly describe what the project is and its overall purpose.
-            3. **## Problem Statement / Idea** – Explain the problem it solves or the goal it aims to achieve.
-            4. **## Features** – List key features and functionalities implemented in the code.
-            5. **## How It Works (Implementation Overview)** – Describe the internal logic, core components, and workflow.
-            6. **## Tech Stack** – List programming languages, libraries, frameworks, and tools used.
-            7. **## Getting Started (optional)** – If setup steps are found in the code (like setup.py, package.json, or Dockerfile), summarize them here.
-            8. **## Conclusion** – Wrap up with a summary of the project's capabilities and use cases.
-
-            CODE ANALYSIS:
-            {combined_analyses}
-
-            Guidelines:
-            - Only include information that is evident from the code analysis. Do not speculate.
-            - Use proper Markdown formatting (headings, bullet points, code blocks, etc.).
-            - Maintain clarity, conciseness, and technical accuracy.
-            """
-        elif output_type == "guidance":
-                prompt = f"""
-                You are a senior software engineer and technical project architect. Based on the following code analysis from the GitHub repository "{project_name}", generate a **precise and prioritized Markdown guide** that outlines **only what is missing, incomplete, flawed, or needs improvement** in the current project.
-
-                Your output should **strictly reflect the gaps and issues in the existing code** and serve as a clear technical to-do list to complete and enhance the project into a robust, full-stack application.
-
-                ### Your guide must:
-                1. Focus **only** on what is missing, partially implemented, buggy, or poorly structured — **do not add general guidance or best practices** unless the code clearly lacks it.
-                2. Include:
-                - Components or features that are not present but are implied to be needed
-                - Incomplete logic, commented-out or placeholder sections
-                - Bugs, unhandled cases, and performance concerns
-                - Code quality or structural issues that require refactoring
-                3. Highlight full-stack gaps:
-                - If the frontend is missing, clearly list what should be added based on backend endpoints or expected user interactions.
-                - If the backend is missing or incomplete, infer needed APIs or data handling from the frontend or related files.
-                - Point out if there’s no database model despite persistent data needs, no authentication for protected routes, or missing deployment configuration.
-                4. Group guide items under **technical categories** such as:
-                - `Frontend`
-                - `Backend`
-                - `API`
-                - `Database`
-                - `Authentication & Authorization`
-                - `Testing`
-                - `Deployment`
-                - `Code Quality & Refactoring`
-                5. Use Markdown guide under the header:
-
-                ## ✅ Next Steps to Complete and Improve the Project
-
-                CODE ANALYSIS:
-                {combined_analyses}
-
-                ### Output Instructions:
-                - Be brief but technically clear.
-                - Do **not** describe what is already complete unless it needs fixing or revision.
-                - Do **not** add assumptions not backed by the code.
-                - Prioritize core issues before enhancements.
-                """
-
-        else:
-            # Default to analysis if an unknown type is provided
-            logger.warning(f"Unknown output type '{output_type}', defaulting to 'analysis'")
-            return self.generate_project_summary(analyses, project_name, "analysis")
+        return asyncio.run(summarize())
 
+    async def generate_project_summary_async(self, gemini: GeminiClient, analyses: List[str], project_name: str,
+                                             output_type: str = "analysis") -> str:
+        """
+        Generate a project summary through the bounded Gemini client without blocking the event loop.
+        
+        More than SUMMARY_REDUCE_THRESHOLD analyses are first condensed into
+        intermediate summaries, which are requested concurrently.
+        
+        Args:
+            gemini: Bounded Gemini client shared by the analysis
+            analyses: List of code analyses
+            project_name: Name of the GitHub repository
+            output_type: Type of output to generate (analysis, readme, guidance)
+            
+        Returns:
+            str: Markdown report
+        """
+        output_type = self._normalize_output_type(output_type)
+        
+        # Condense large sets of analyses first so the final prompt stays small
+        while len(analyses) > SUMMARY_REDUCE_THRESHOLD:
+            logger.info(f"Condensing {len(analyses)} analyses in groups of {SUMMARY_GROUP_SIZE}")
+            analyses = await self._reduce_analyses_async(gemini, analyses, project_name)
+        
+        prompt = self._build_summary_prompt(analyses, project_name, output_type)
+        
         try:
-            response = self.model.generate_content(prompt)
-            return response.text
+            return await self._generate_cached(gemini, self._cache_key(prompt), prompt, f"{output_type} summary")
         except Exception as e:
             logger.error(f"Failed to generate project summary: {e}")
             return f"# Error Generating Project Summary\n\nAn error occurred: {str(e)}"
 
+    async def _reduce_analyses_async(self, gemini: GeminiClient, analyses: List[str], project_name: str) -> List[str]:
+        """
+        Condense groups of analyses into intermediate summaries concurrently.
+        
+        Args:
+            gemini: Bounded Gemini client shared by the analysis
+            analyses: List of code analyses
+            project_name: Name of the GitHub repository
+            
+        Returns:
+            List[str]: One intermediate summary per group of SUMMARY_GROUP_SIZE analyses
+        """
+        groups = [analyses[i:i + SUMMARY_GROUP_SIZE] for i in range(0, len(analyses), SUMMARY_GROUP_SIZE)]
+        return await asyncio.gather(*[
+            self._summarize_group_async(gemini, group, project_name, f"intermediate summary {i+1}/{len(groups)}")
+            for i, group in enumerate(groups)
+        ])
+
+    async def _summarize_group_async(self, gemini: GeminiClient, analyses: List[str], project_name: str,
+                                     description: str) -> str:
+        """
+        Condense one group of analyses into an intermediate summary.
+        
+        Args:
+            gemini: Bounded Gemini client shared by the analysis
+            analyses: Group of code analyses
+            project_name: Name of the GitHub repository
+            description: Label for the request in logs
+            
+        Returns:
+            str: Intermediate summary, or the analyses joined as-is if the request fails
+        """
+        combined_analyses = "\n\n".join(analyses)
+        prompt = _INTERMEDIATE_TMPL.substitute(project_name=project_name, analyses=combined_analyses)
+        
+        try:
+            return await self._generate_cached(gemini, self._cache_key(prompt), prompt, description)
+        except Exception as e:
+            # Keep the original analyses so the final summary still sees them
+            logger.error(f"Failed to generate {description}: {e}")
+            return combined_analyses
+
     def ask_question_about_repo(self, repo_name: str, analyses: List[str], question: str) -> str:
         """
         Answer a question about the repository based on the analysis.
@@ -395,8 +1472,7 @@ class GitHubRepoAnalyzer:
         """
         
         try:
-            response = self.model.generate_content(prompt)
-            return response.text
+            return self._generate_content(prompt)
         except Exception as e:
             logger.error(f"Failed to answer question about repository: {e}")
             return f"I apologize, but I encountered an error while trying to answer your question: {str(e)}"
@@ -413,8 +1489,30 @@ class GitHubRepoAnalyzer:
         Returns:
             Tuple[str, str]: (report_path, report_content)
         """
+        report_path, report_content, _ = asyncio.run(self.analyze_repository_async(repo_url, output_type, output_dir))
+        return report_path, report_content
+
+    async def analyze_repository_async(self, repo_url: str, output_type: str = "analysis",
+                                       output_dir: str = None) -> Tuple[str, str, List[str]]:
+        """
+        Analyze a GitHub repository and generate a report, analyzing code chunks concurrently.
+        
+        The per-file analyses are returned rather than stored on the analyzer, so one
+        instance can serve several jobs at once.
+        
+        Args:
+            repo_url: URL of the GitHub repository
+            output_type: Type of output to generate (analysis, readme, guidance)
+            output_dir: Directory to save the report
+            
+        Returns:
+            Tuple[str, str, List[str]]: (report_path, report_content, analyses)
+        """
+        # Normalize once so the prompt, cache key and report filename agree
+        output_type = self._normalize_output_type(output_type)
+        
         # Create temporary directory for cloning
-        with tempfile.TemporaryDirectory() as temp_dir:
+        with tempfile.TemporaryDirectory(dir=CLONE_TMPDIR) as temp_dir:
             # Extract repository name from URL for reporting
             repo_name = repo_url.rstrip('/').split('/')[-1]
             if repo_name.endswith('.git'):
@@ -424,52 +1522,74 @@ class GitHubRepoAnalyzer:
             
             # Clone the repository
             if not self.clone_repository(repo_url, temp_dir):
-                return None, f"# Analysis Failed\n\nFailed to clone repository: {repo_url}"
+                return None, f"# Analysis Failed\n\nFailed to clone repository: {repo_url}", []
             
             # Collect code files
             code_files = self.collect_code_files(temp_dir)
             if not code_files:
-                return None, f"# Analysis Failed\n\nNo code files found in repository: {repo_url}"
+                return None, f"# Analysis Failed\n\nNo code files found in repository: {repo_url}", []
             
-            # Analyze code files
-            analyses = []
+            # Score every collected file up front so both caps keep the most representative ones
+            scores = {
+                filepath: self._score_file(os.path.relpath(filepath, temp_dir))
+                for files in code_files.values()
+                for filepath in files
+            }
+            
+            # Select the code files to analyze
+            selected_files = []
             for extension, files in code_files.items():
                 language = extension.lstrip('.') if extension else 'unknown'
                 logger.info(f"Analyzing {len(files)} {language} files")
                 
-                # Limit the number of files per language to analyze
+                # Limit the number of files per language to analyze; the sort is
+                # stable, so equal scores keep the collection order
                 max_files_per_lang = 10
                 if len(files) > max_files_per_lang:
                     logger.info(f"Limiting analysis to {max_files_per_lang} {language} files")
-                    files = files[:max_files_per_lang]
                 
-                for filepath in files:
-                    rel_path = os.path.relpath(filepath, temp_dir)
-                    logger.info(f"Analyzing file: {rel_path}")
-                    
-                    # Read file content
-                    content = self.read_file_content(filepath)
-                    if not content or content.startswith('[Error'):
-                        continue
-                    
-                    # Split large files into chunks
-                    chunks = self.split_large_text(content)
-                    file_analysis = []
-                    
-                    for i, chunk in enumerate(chunks):
-                        context = f"file {rel_path} (part {i+1}/{len(chunks)})"
-                        analysis = self.analyze_code_chunk(chunk, context)
-                        file_analysis.append(analysis)
-                    
-                    # Combine file analyses
-                    combined_file_analysis = f"## Analysis of {rel_path}\n\n" + "\n\n".join(file_analysis)
-                    analyses.append(combined_file_analysis)
-            
-            # Store the analyses for chat functionality
-            self._last_analyses = analyses
-            
-            # Generate report based on specified output type
-            report_content = self.generate_project_summary(analyses, repo_name, output_type)
+                # Sniff for binaries lazily, best first, so binaries without an ignored
+                # extension do not take a slot and only files that could be picked are opened
+                picked = []
+                for filepath in sorted(files, key=scores.__getitem__, reverse=True):
+                    if len(picked) == max_files_per_lang:
+                        break
+                    if not self._is_binary_file(filepath):
+                        picked.append(filepath)
+                
+                selected_files.extend(picked)
+            
+            if not selected_files:
+                return None, f"# Analysis Failed\n\nNo text code files found in repository: {repo_url}", []
+            
+            # Keep the most representative files so the number of requests stays bounded
+            if len(selected_files) > MAX_FILES_GLOBAL:
+                logger.info(f"Limiting analysis to the top {MAX_FILES_GLOBAL} of {len(selected_files)} files")
+                selected_files = heapq.nlargest(MAX_FILES_GLOBAL, selected_files, key=scores.__getitem__)
+            
+            # Start reading file contents in the background while the client is set up
+            logger.info(f"Reading {len(selected_files)} files")
+            read_tasks = [
+                asyncio.create_task(self.read_file_content_async(filepath))
+                for filepath in selected_files
+            ]
+            
+            async with GeminiClient(self.api_key, self.model.model_name, self.limiter) as gemini:
+                contents = await asyncio.gather(*read_tasks)
+                
+                # Pair readable text files with their repository-relative paths; they
+                # are split into chunks as they are analyzed
+                files = [
+                    (os.path.relpath(filepath, temp_dir), content)
+                    for filepath, content in zip(selected_files, contents)
+                    if content and not content.startswith('[Error')
+                ]
+                
+                # Analyze code files
+                analyses = await self.analyze_files_async(gemini, files)
+                
+                # Generate report based on specified output type
+                report_content = await self.generate_project_summary_async(gemini, analyses, repo_name, output_type)
             
             # Create appropriate filename based on output type
             filename_suffix = {
@@ -482,20 +1602,21 @@ class GitHubRepoAnalyzer:
             if output_dir:
                 os.makedirs(output_dir, exist_ok=True)
                 report_path = os.path.join(output_dir, f"{repo_name}_{filename_suffix}.md")
-                with open(report_path, 'w', encoding='utf-8') as f:
-                    f.write(report_content)
+                async with aiofiles.open(report_path, 'w', encoding='utf-8') as f:
+                    await f.write(report_content)
                 logger.info(f"{output_type.capitalize()} report saved to: {report_path}")
             else:
                 report_path = None
                 
-            return report_path, report_content
+            return report_path, report_content, analyses
     
-    def export_to_pdf(self, markdown_path: str) -> str:
+    def export_to_pdf(self, markdown_path: str, markdown_content: Optional[str] = None) -> str:
         """
         Convert markdown report to PDF.
         
         Args:
             markdown_path: Path to the markdown file
+            markdown_content: Content of the markdown file, if already in memory
             
         Returns:
             str: Path to the generated PDF file
@@ -503,215 +1624,25 @@ class GitHubRepoAnalyzer:
         try:
             pdf_path = os.path.splitext(markdown_path)[0] + '.pdf'
             
-            # Read markdown content
-            with open(markdown_path, 'r', encoding='utf-8') as f:
-                markdown_content = f.read()
+            # Read markdown content unless the caller already has it
+            if markdown_content is None:
+                with open(markdown_path, 'r', encoding='utf-8') as f:
+                    markdown_content = f.read()
             
             # Convert markdown to HTML
-            html_content = markdown.markdown(markdown_content, extensions=['extra', 'codehilite'])
+            # The converter keeps state between calls, so jobs sharing this analyzer take turns
+            with self._md_lock:
+                html_content = self._md.reset().convert(markdown_content)
             
             # Add some basic styling
-            styled_html = f"""
-            <!DOCTYPE html>
-                <html>
-                <head>
-                    <meta charset="UTF-8">
-                    <title>Repository Analysis</title>
-                    <style>
-                        /* Base styles */
-                        body {{
-                            font-family: 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, 'Open Sans', 'Helvetica Neue', sans-serif;
-                            line-height: 1.6;
-                            max-width: 900px;
-                            margin: 0 auto;
-                            padding: 30px;
-                            color: #333;
-                            background-color: #fff;
-                        }}
-
-                        /* Headers */
-                        h1 {{
-                            font-size: 28px;
-                            color: #2c3e50;
-                            border-bottom: 2px solid #3498db;
-                            padding-bottom: 10px;
-                            margin-top: 20px;
-                            font-weight: 600;
-                        }}
-
-                        h2 {{
-                            font-size: 24px;
-                            color: #2980b9;
-                            margin-top: 24px;
-                            border-left: 4px solid #3498db;
-                            padding-left: 10px;
-                            font-weight: 500;
-                        }}
-
-                        h3 {{
-                            font-size: 20px;
-                            color: #16a085;
-                            margin-top: 20px;
-                            font-weight: 500;
-                        }}
-
-                        /* Paragraphs and text */
-                        p {{
-                            margin-bottom: 16px;
-                            text-align: justify;
-                        }}
-
-                        strong {{
-                            color: #2c3e50;
-                            font-weight: 600;
-                        }}
-
-                        em {{
-                            color: #7f8c8d;
-                        }}
-
-                        /* Code blocks */
-                        code {{
-                            font-family: 'Consolas', 'Monaco', 'Courier New', monospace;
-                            background-color: #f7f9fb;
-                            color: #e74c3c;
-                            padding: 2px 5px;
-                            border-radius: 3px;
-                            font-size: 90%;
-                            border: 1px solid #eaecef;
-                        }}
-
-                        pre {{
-                            background-color: #f8f8f8;
-                            padding: 15px;
-                            border-radius: 5px;
-                            overflow-x: auto;
-                            border: 1px solid #e1e4e8;
-                            margin: 16px 0;
-                        }}
-
-                        pre code {{
-                            background-color: transparent;
-                            padding: 0;
-                            border: none;
-                            color: #333;
-                            font-size: 14px;
-                            line-height: 1.5;
-                        }}
-
-                        /* Lists */
-                        ul, ol {{
-                            padding-left: 20px;
-                            margin-bottom: 16px;
-                        }}
-
-                        li {{
-                            margin-bottom: 8px;
-                        }}
-
-                        /* Tables */
-                        table {{
-                            border-collapse: collapse;
-                            width: 100%;
-                            margin: 20px 0;
-                            box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-                        }}
-
-                        th, td {{
-                            text-align: left;
-                            padding: 12px;
-                            border: 1px solid #e1e4e8;
-                        }}
-
-                        th {{
-                            background-color: #f1f8ff;
-                            color: #0366d6;
-                            font-weight: 600;
-                        }}
-
-                        tr:nth-child(even) {{
-                            background-color: #f6f8fa;
-                        }}
-
-                        tr:hover {{
-                            background-color: #f0f4f8;
-                        }}
-
-                        /* Blockquotes */
-                        blockquote {{
-                            border-left: 4px solid #3498db;
-                            padding: 10px 15px;
-                            margin: 16px 0;
-                            background-color: #f8f9fa;
-                            color: #4a5568;
-                            font-style: italic;
-                        }}
-
-                        /* Links */
-                        a {{
-                            color: #3498db;
-                            text-decoration: none;
-                        }}
-
-                        a:hover {{
-                            text-decoration: underline;
-                            color: #2980b9;
-                        }}
-
-                        /* Page header */
-                        .repo-header {{
-                            background-color: #f1f8ff;
-                            padding: 20px;
-                            margin-bottom: 30px;
-                            border-radius: 8px;
-                            border-left: 5px solid #0366d6;
-                        }}
-
-                        .repo-header h1 {{
-                            margin-top: 0;
-                            border-bottom: none;
-                        }}
-
-                        /* Feature boxes */
-                        .feature-section {{
-                            margin: 25px 0;
-                            padding: 20px;
-                            background-color: #f8f9fa;
-                            border-radius: 8px;
-                            border: 1px solid #e1e4e8;
-                        }}
-
-                        /* Footer */
-                        .footer {{
-                            margin-top: 40px;
-                            padding-top: 20px;
-                            border-top: 1px solid #eaecef;
-                            color: #6c757d;
-                            font-size: 14px;
-                            text-align: center;
-                        }}
-                    </style>
-                </head>
-                <body>
-                    <div class="repo-header">
-                        <h1>Repository Analysis Report</h1>
-                        <p>Comprehensive analysis powered by Google's Gemini AI</p>
-                    </div>
-
-                    {html_content}
-
-                    <div class="footer">
-                        <p>Generated on {datetime.now().strftime("%Y-%m-%d at %H:%M:%S")} | GitHub Repository Analyzer</p>
-                    </div>
-                </body>
-            </html>
-            """
-            
-            # Specify path to wkhtmltopdf executable
-            config = pdfkit.configuration(wkhtmltopdf='C:\\Program Files\\wkhtmltopdf\\bin\\wkhtmltopdf.exe')
-            
-            # Convert HTML to PDF with configuration
-            pdfkit.from_string(styled_html, pdf_path, configuration=config)
+            styled_html = _PDF_TEMPLATE.substitute(
+                html_content=html_content,
+                timestamp=datetime.now().strftime("%Y-%m-%d at %H:%M:%S")
+            )
+            
+            # Render the PDF in-process (imported lazily since PDF export is optional)
+            from weasyprint import HTML
+            HTML(string=styled_html).write_pdf(pdf_path)
             logger.info(f"PDF report saved to: {pdf_path}")
             return pdf_path
             
@@ -756,7 +1687,7 @@ def main():
         
     # Export to PDF if requested
     if args.pdf:
-        pdf_path = analyzer.export_to_pdf(report_path)
+        pdf_path = analyzer.export_to_pdf(report_path, report_content)
         if pdf_path:
             print(f"PDF report saved to: {pdf_path}")
     